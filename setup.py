@@ -8,5 +8,6 @@ setup(
     version="1.1.0",
     python_requires=">=3.7",
     install_requires=["numpy>=1.11"],
+    extras_require={"numba": ["numba"]},
     tests_requires=["pytest >= 7.1", "hypothesis >= 6.45"],
 )
@@ -0,0 +1,34 @@
+"""Numba-compiled kernels used by `basic_functions`, when numba is available.
+
+These live in their own module so that numba is only imported once a
+kernel is actually needed."""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional dependency
+    njit = None  # type: ignore[assignment]
+
+__all__ = ["pairwise_dists_kernel"]
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def pairwise_dists_kernel(x, y, out):
+        # Accumulates each squared distance directly from the difference of
+        # the rows, in a single pass and without any (M, N) temporaries.
+        # Unlike the `|x|^2 - 2 x.y + |y|^2` expansion, this cannot produce
+        # (slightly) negative squared distances.
+        M, D = x.shape
+        N = y.shape[0]
+        for i in prange(M):
+            for j in range(N):
+                s = 0.0
+                for k in range(D):
+                    d = x[i, k] - y[j, k]
+                    s += d * d
+                out[i, j] = np.sqrt(s)
+
+else:
+    pairwise_dists_kernel = None
@@ -1,9 +1,27 @@
+import re
+from functools import lru_cache
+
 import numpy as np
-from itertools import groupby
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
 __all__ = ["count_vowels", "merge_max_mappings"]
 
+_VOWELS = frozenset("aeiouAEIOU")
+_VOWELS_Y = frozenset("aeiouyAEIOUY")
+
+# The byte values that are *not* (ASCII) vowels. Deleting these from a
+# UTF-8 encoded string, via `bytes.translate`, leaves only the vowels
+# behind: every byte of a multi-byte UTF-8 sequence is >= 0x80, and thus
+# can never be mistaken for a vowel.
+_NON_VOWEL_BYTES = bytes(c for c in range(256) if chr(c) not in _VOWELS)
+_NON_VOWEL_BYTES_Y = bytes(c for c in range(256) if chr(c) not in _VOWELS_Y)
+
+# Matches a maximal run of a repeated character (including newlines)
+_RUN_PATTERN = re.compile(r"(.)\1*", re.DOTALL)
+
+# Sentinel for lookups where `None` could be a legitimate value
+_MISSING: Any = object()
+
 
 def count_vowels(x: str, include_y: bool = False) -> int:
     """Returns the number of vowels contained in `x`.
@@ -29,12 +47,11 @@ def count_vowels(x: str, include_y: bool = False) -> int:
     >>> count_vowels("happy", include_y=True)
     2
     """
-    vowels = set("aeiouAEIOU")
-
-    if include_y:
-        vowels.update("yY")
-
-    return sum(char in vowels for char in x)
+    # `bytes.translate` scans the string in a single C-level pass,
+    # rather than doing a Python-level membership check per character.
+    # "surrogatepass" permits lone surrogates, which are not vowels anyway.
+    non_vowels = _NON_VOWEL_BYTES_Y if include_y else _NON_VOWEL_BYTES
+    return len(x.encode("utf-8", "surrogatepass").translate(None, non_vowels))
 
 
 def merge_max_mappings(
@@ -64,11 +81,23 @@ def merge_max_mappings(
     >>> merge_max_mappings(x, y)
     {'a': 1, 'b': 100, 'c': -1}
     """
+    # There is nothing to compare if either dictionary is empty
+    if not dict2:
+        return dict(dict1)
+    if not dict1:
+        return dict(dict2)
+
     # `dict(dict1)` makes a copy of `dict1`. We do this
     # so that updating `merged` doesn't also update `dict1`
     merged = dict(dict1)
+
+    # A single `get` probe replaces the `key in merged` check followed
+    # by the `merged[key]` lookup
+    get = merged.get
+    missing = _MISSING
     for key, value in dict2.items():
-        if key not in merged or value > merged[key]:
+        current = get(key, missing)
+        if current is missing or value > current:
             merged[key] = value
     return merged
 
@@ -103,23 +132,40 @@ def leftpad(string: str, width: int, fillchar: str) -> str:
     """
     assert isinstance(width, int) and width >= 0, width
     assert isinstance(fillchar, str) and len(fillchar) == 1, fillchar
-    margin = max(width - len(string), 0)
-    return margin * fillchar + string
+    return string.rjust(width, fillchar)
 
 
 def safe_name(obj: Any, repr_allowed: bool=True) -> str:
     """Tries to get a descriptive name for an object. Returns '<unknown>`
     instead of raising - useful for writing descriptive/safe error messages."""
-    if hasattr(obj, "__qualname__"):
-        return obj.__qualname__
+    # `getattr` with a default fetches the attribute in the same lookup
+    # that checks for its existence, unlike `hasattr` followed by access
+    name = getattr(obj, "__qualname__", None)
+    if name is not None:
+        return name
+
+    name = getattr(obj, "__name__", None)
+    if name is not None:
+        return name
+
+    if repr_allowed:
+        try:
+            return repr(obj)
+        except Exception:
+            pass
+
+    return "<unknown>"
 
-    if hasattr(obj, "__name__"):
-        return obj.__name__
 
-    if repr_allowed and hasattr(obj, "__repr__"):
-        return repr(obj)
+def _ascii_runs(in_string: str) -> Iterable[Tuple[str, int]]:
+    """Returns the (character, run-length) pairs of an ASCII string.
 
-    return "<unknown>"
+    The run boundaries are found with a single vectorized comparison of
+    adjacent bytes, which is faster than a regex scan for long strings."""
+    codes = np.frombuffer(in_string.encode("ascii"), dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+    counts = np.diff(np.append(starts, len(codes)))
+    return zip(codes[starts].tobytes().decode("ascii"), counts.tolist())
 
 
 def run_length_encoder(in_string: str) -> List[Union[str, int]]:
@@ -129,8 +175,16 @@ def run_length_encoder(in_string: str) -> List[Union[str, int]]:
     """
     assert isinstance(in_string, str)
     out = []
-    for item, group in groupby(in_string):
-        cnt = sum(1 for x in group)
+    if len(in_string) > 256 and in_string.isascii():
+        runs = _ascii_runs(in_string)
+    else:
+        # The regex engine finds each run in C, rather than counting the
+        # members of each group one character at a time
+        runs = (
+            (match.group(1), match.end() - match.start())
+            for match in _RUN_PATTERN.finditer(in_string)
+        )
+    for item, cnt in runs:
         if cnt == 1:
             out.append(item)
         else:
@@ -146,16 +200,35 @@ def run_length_decoder(in_list: List[Union[str, int]]) -> str:
     >>> run_length_decoder(['a', 'a', 5, 'b', 'b', 2, 'c', 'b', 'c'])
     "aaaaabbcbc"
     """
-    out = ""
+    # Accumulating the pieces in a list and joining them once avoids
+    # repeatedly copying an ever-growing string
+    parts = []
     for n, item in enumerate(in_list):
         if isinstance(item, int):
-            out += in_list[n - 1] * (item - 2)
+            parts.append(in_list[n - 1] * (item - 2))
         else:
-            out += item
-    return out
+            parts.append(item)
+    return "".join(parts)
 
 
-def pairwise_dists(x, y):
+# The numba kernel computes distances with a scalar loop over the columns,
+# which only outperforms the BLAS-backed NumPy implementation when the
+# row-vectors are very short
+_NUMBA_MAX_COLUMNS = 4
+
+
+@lru_cache(maxsize=None)
+def _load_pairwise_dists_kernel():
+    # numba is slow to import, so the (optional) kernel is only
+    # loaded once it is explicitly requested
+    from ._numba_kernels import pairwise_dists_kernel
+
+    if pairwise_dists_kernel is None:
+        raise ImportError("`pairwise_dists(..., use_numba=True)` requires numba")
+    return pairwise_dists_kernel
+
+
+def pairwise_dists(x, y, block_size=256, use_numba=False):
     """ Computing pairwise Euclidean distance between the respective
     row-vectors of `x` and `y`
 
@@ -163,18 +236,84 @@ def pairwise_dists(x, y):
     ----------
     x : numpy.ndarray, shape=(M, D)
     y : numpy.ndarray, shape=(N, D)
+    block_size : int, optional (default=256)
+        The number of rows of `x` that are processed at a time by the
+        NumPy implementation. This is ignored when the numba kernel
+        is used.
+    use_numba : bool, optional (default=False)
+        If `True`, float64 inputs with D <= 4 are processed by a kernel
+        that is JIT-compiled by numba (which must be installed). Note
+        that the first such call is slow, as numba is imported and the
+        kernel is compiled.
 
     Returns
     -------
     numpy.ndarray, shape=(M, N)
         The Euclidean distance between each pair of
         rows between `x` and `y`."""
-    sqr_dists = -2 * np.matmul(x, y.T)
-    sqr_dists +=  np.sum(x**2, axis=1)[:, np.newaxis]
-    sqr_dists += np.sum(y**2, axis=1)
-    return np.sqrt(np.clip(sqr_dists, a_min=0, a_max=None))
+    if (
+        use_numba
+        and isinstance(x, np.ndarray)
+        and isinstance(y, np.ndarray)
+        and x.dtype == y.dtype == np.float64
+        and x.ndim == y.ndim == 2
+        and x.shape[1] == y.shape[1] <= _NUMBA_MAX_COLUMNS
+    ):
+        kernel = _load_pairwise_dists_kernel()
+        out = np.empty((x.shape[0], y.shape[0]), dtype=np.float64)
+        kernel(x, y, out)
+        return out
+
+    # Non-floating-point inputs (e.g. integers or booleans) are computed
+    # in float64. This avoids integer overflow in the matmul and
+    # permits all of the arithmetic below to be done in-place.
+    x = np.asarray(x)
+    y = np.asarray(y)
+    dtype = np.result_type(x, y)
+    if dtype.kind != "f":
+        dtype = np.dtype(np.float64)
+    x = np.ascontiguousarray(x, dtype=dtype)
+    y = np.ascontiguousarray(y, dtype=dtype)
+    out = np.empty((x.shape[0], y.shape[0]), dtype=dtype)
+
+    # `einsum` computes the squared row-norms without materializing
+    # `x**2` and `y**2`. The distances are computed for one block of
+    # rows at a time so that each block stays in cache while all of
+    # its (in-place) arithmetic is performed.
+    y_sqr_norms = np.einsum("ij,ij->i", y, y)
+    for start in range(0, x.shape[0], block_size):
+        x_block = x[start : start + block_size]
+        sqr_dists = np.matmul(x_block, y.T)
+        sqr_dists *= -2
+        sqr_dists += np.einsum("ij,ij->i", x_block, x_block)[:, np.newaxis]
+        sqr_dists += y_sqr_norms
+        np.clip(sqr_dists, a_min=0, a_max=None, out=sqr_dists)
+        np.sqrt(sqr_dists, out=out[start : start + block_size])
+    return out
+
 
+def softmax(x, out=None):
+    """ Computes the softmax of `x`.
 
-def softmax(x):
-    x = x - x.max()
-    return np.exp(x) / np.exp(x).sum()
+    Parameters
+    ----------
+    x : array_like
+    out : Optional[numpy.ndarray]
+        A preallocated array, matching the shape of `x`, in
+        which the result is stored.
+
+    Returns
+    -------
+    numpy.ndarray
+        The softmax of `x`."""
+    x = np.asarray(x)
+    if out is None:
+        # Promoting against float16 selects the same floating-point
+        # type that `np.exp` would produce for `x`
+        out = np.empty(x.shape, dtype=np.result_type(x.dtype, np.float16))
+
+    # Every step writes into `out`, so no intermediate arrays are created
+    np.subtract(x, x.max(), out=out)
+    np.exp(out, out=out)
+    out /= out.sum()
+    return out
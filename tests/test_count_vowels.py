@@ -0,0 +1,26 @@
+import pytest
+
+from pbt_tutorial.basic_functions import count_vowels
+
+
+@pytest.mark.parametrize(
+    "input_string, include_y, expected_count",
+    [
+        # non-ASCII letters are never vowels
+        ("ßøæçñ漢字", False, 0),
+        ("ßøæçñ漢字", True, 0),
+        # accented vowels are not counted; only their ASCII neighbors are
+        ("àéîõüÿ aeiouy", False, 5),
+        ("àéîõüÿ aeiouy", True, 6),
+        ("ÀÉÎÕÜŸ AEIOUY", False, 5),
+        ("ÀÉÎÕÜŸ AEIOUY", True, 6),
+        # lone surrogates are encoded with "surrogatepass" and never count
+        ("\ud800a\udfffy", False, 1),
+        ("\ud800a\udfffy", True, 2),
+        # 2- and 4-byte UTF-8 characters mixed with ASCII vowels
+        ("\U0001F600eāy", False, 1),
+        ("\U0001F600eāy", True, 2),
+    ],
+)
+def test_count_vowels_non_ascii(input_string, include_y, expected_count):
+    assert count_vowels(input_string, include_y) == expected_count
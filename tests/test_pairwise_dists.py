@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from pbt_tutorial.basic_functions import pairwise_dists
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+@pytest.mark.parametrize(
+    "x, y",
+    [
+        (np.ones((2, 3)), np.ones((2, 2))),
+        (np.ones((2, 2)), np.ones((2, 3))),
+        (np.ones(3), np.ones(3)),
+    ],
+)
+def test_pairwise_dists_rejects_mismatched_shapes(x, y, use_numba):
+    # mismatched row-vectors must raise, regardless of whether
+    # the numba kernel or the NumPy implementation is requested
+    if use_numba:
+        pytest.importorskip("numba")
+    with pytest.raises(ValueError):
+        pairwise_dists(x, y, use_numba=use_numba)
+
+
+@pytest.mark.parametrize("dtype", [bool, np.int8, np.int64])
+def test_pairwise_dists_non_float_inputs(dtype):
+    x = np.array([[1, 0]], dtype=dtype)
+    y = np.array([[1, 1]], dtype=dtype)
+    out = pairwise_dists(x, y)
+    assert out.dtype == np.float64
+    assert np.allclose(out, [[1.0]])
+
+
+@pytest.mark.parametrize("num_columns", [1, 2, 3, 4])
+def test_pairwise_dists_numba_matches_numpy(num_columns):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(num_columns)
+    x = rng.normal(size=(7, num_columns))
+    y = rng.normal(size=(5, num_columns))
+    expected = pairwise_dists(x, y)
+    actual = pairwise_dists(x, y, use_numba=True)
+    assert actual.dtype == expected.dtype == np.float64
+    assert np.allclose(actual, expected)
+    # the rows of `x` are at zero distance from themselves
+    assert np.allclose(np.diag(pairwise_dists(x, x, use_numba=True)), 0.0)
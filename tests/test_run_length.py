@@ -0,0 +1,34 @@
+from hypothesis import given, strategies as st
+
+from pbt_tutorial.basic_functions import (
+    _RUN_PATTERN,
+    run_length_decoder,
+    run_length_encoder,
+)
+
+
+def _regex_encoder(in_string):
+    # the code path taken by short or non-ASCII strings
+    out = []
+    for match in _RUN_PATTERN.finditer(in_string):
+        item, cnt = match.group(1), match.end() - match.start()
+        out.extend(item if cnt == 1 else (item, item, cnt))
+    return out
+
+
+# ASCII strings longer than 256 characters take the vectorized code path
+@given(st.text(alphabet="ab\n", min_size=257, max_size=1000))
+def test_long_ascii_run_length_encoder(in_string):
+    encoded = run_length_encoder(in_string)
+    assert encoded == _regex_encoder(in_string)
+    # run-lengths must be Python integers, not NumPy integers
+    assert all(type(x) in (str, int) for x in encoded)
+    assert run_length_decoder(encoded) == in_string
+
+
+def test_long_ascii_run_length_encoder_example():
+    in_string = "a" * 300 + "b" + "\n" * 5
+    encoded = run_length_encoder(in_string)
+    assert encoded == ["a", "a", 300, "b", "\n", "\n", 5]
+    assert type(encoded[2]) is int
+    assert run_length_decoder(encoded) == in_string
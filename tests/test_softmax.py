@@ -0,0 +1,20 @@
+import numpy as np
+
+from pbt_tutorial.basic_functions import softmax
+
+
+def test_softmax_fills_and_returns_out():
+    x = np.array([1.0, 2.0, 3.0])
+    out = np.full(3, np.nan)
+    result = softmax(x, out=out)
+    assert result is out
+    assert np.allclose(out, np.exp(x) / np.exp(x).sum())
+    # the input is left untouched
+    assert np.array_equal(x, [1.0, 2.0, 3.0])
+
+
+def test_softmax_accepts_lists():
+    result = softmax([10.0, 10.0, 10.0])
+    assert isinstance(result, np.ndarray)
+    assert np.allclose(result, [1 / 3, 1 / 3, 1 / 3])
+    assert np.allclose(softmax([0.0, 10000.0, 0.0]), [0.0, 1.0, 0.0])